@@ -1,11 +1,164 @@
 import pdfplumber
+import docx
 from docx import Document
 from docx.shared import Inches, Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_UNDERLINE
 from docx.oxml.shared import OxmlElement, qn
+from docx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+from docx.opc.pkgwriter import _ContentTypesItem
+import io
+import os
 import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
 
-def extract_with_tables_and_formatting(pdf_path):
+# Matches a leading bullet glyph run, numbered marker or lettered marker
+_BULLET_ANY_RE = re.compile(r'^(?:[\s•◦\-*▪▫]+|\s*\d+\.\s*|\s*[a-zA-Z]\.\s*)')
+# Single-character bullet glyphs, checked with a set lookup before any regex
+_BULLET_CHARS = frozenset('•◦-*▪▫')
+# Resume section keywords that get a bold paragraph
+_SECTION_RE = re.compile(r'summary|objective|experience|education|skills')
+
+# python-docx's default template, read once and reused for every conversion
+with open(os.path.join(os.path.dirname(docx.__file__), 'templates', 'default.docx'), 'rb') as _template:
+    _TEMPLATE_BYTES = _template.read()
+
+PAGE_WINDOW = 50  # Max pages one worker keeps open; bounds pdfplumber's cached layout objects
+MIN_PAGES_PER_WORKER = 10  # Below this, process start-up and PDF reopening cost more than they save
+
+def extract_pages(pdf_path, max_workers=None):
+    """
+    Yield each page's blocks in page order, extracting page windows in
+    parallel worker processes
+    """
+    with pdfplumber.open(pdf_path) as pdf:
+        total_pages = len(pdf.pages)
+    
+    max_workers = max_workers or os.cpu_count() or 1
+    window = min(PAGE_WINDOW, max(MIN_PAGES_PER_WORKER, -(-total_pages // max_workers)))
+    tasks = [
+        (pdf_path, list(range(start + 1, min(start + window, total_pages) + 1)))
+        for start in range(0, total_pages, window)
+    ]
+    
+    if max_workers == 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield from extract_page_range(task)
+        return
+    
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+        for page_blocks in executor.map(extract_page_range, tasks):
+            yield from page_blocks
+
+def extract_page_range(task):
+    """Open the PDF for one window of pages and return each page's blocks"""
+    pdf_path, page_numbers = task
+    results = []
+    with pdfplumber.open(pdf_path, pages=page_numbers) as pdf:
+        for page_num, page in zip(page_numbers, pdf.pages):
+            print(f"Processing page {page_num}...")
+            results.append(extract_page_blocks(page))
+    return results
+
+def extract_page_blocks(page):
+    """
+    Extract a page into a list of plain dict blocks (tables, paragraphs,
+    headings) that can be sent back from a worker process
+    """
+    blocks = []
+    
+    # Try to extract tables first
+    table_areas = []
+    for table in page.find_tables():
+        table_data = table.extract()
+        if table_data and len(table_data) > 0:
+            blocks.append({'type': 'table', 'rows': table_data})
+            table_areas.append(table.bbox)
+    
+    # Extract words with their font details for better formatting
+    words = page.extract_words(extra_attrs=['size', 'fontname'])
+    text = None if words else page.extract_text()
+    
+    # Everything needed from the page is pulled out; drop its parsed chars and
+    # layout objects now so they are not held during the grouping work below
+    page.flush_cache()
+    
+    if words:
+        # Drop words inside a table; they were already emitted as table cells
+        if table_areas:
+            words = [
+                word for word in words
+                if not any(x0 <= word['x0'] <= x1 and top <= word['top'] <= bottom
+                           for x0, top, x1, bottom in table_areas)
+            ]
+        
+        # Pull the fields used for grouping into parallel lists once
+        y_keys = [round(word['bottom'], 1) for word in words]  # Round to group words on same baseline
+        x_positions = [word['x0'] for word in words]
+        font_sizes = [word['size'] for word in words]
+        texts = [word['text'] for word in words]
+        
+        # Order words top to bottom, then left to right. Plain (y, x, index)
+        # tuples compare in C, so no per-word key function is called
+        order = [i for _, _, i in sorted(zip(y_keys, x_positions, range(len(words))))]
+        
+        # Reorder the columns once so each line is a contiguous slice
+        y_keys = list(map(y_keys.__getitem__, order))
+        font_sizes = list(map(font_sizes.__getitem__, order))
+        texts = list(map(texts.__getitem__, order))
+        
+        current_paragraph_text = []
+        end = 0
+        
+        for y_pos, run in groupby(y_keys):
+            start, end = end, end + len(list(run))
+            
+            # Extract text from line
+            line_text = ' '.join(texts[start:end]).strip()
+            
+            if not line_text:
+                # Empty line - finish current paragraph
+                if current_paragraph_text:
+                    blocks.append({'type': 'paragraph', 'text': ' '.join(current_paragraph_text)})
+                    current_paragraph_text = []
+                continue
+            
+            # Detect if this should be a new paragraph (large font, all caps, etc.)
+            avg_font_size = sum(font_sizes[start:end]) / (end - start)
+            is_upper = line_text.isupper()
+            line_len = len(line_text)
+            is_likely_header = (
+                avg_font_size > 14 or 
+                is_upper or 
+                line_len < 50
+            )
+            
+            if is_likely_header and current_paragraph_text:
+                # Finish previous paragraph
+                blocks.append({'type': 'paragraph', 'text': ' '.join(current_paragraph_text)})
+                current_paragraph_text = []
+                
+                # Add header
+                if is_upper and line_len < 30:
+                    blocks.append({'type': 'heading', 'text': line_text})
+                else:
+                    blocks.append({'type': 'emphasis', 'text': line_text, 'font_size': avg_font_size})
+            else:
+                current_paragraph_text.append(line_text)
+        
+        # Add any remaining paragraph
+        if current_paragraph_text:
+            blocks.append({'type': 'paragraph', 'text': ' '.join(current_paragraph_text)})
+    
+    else:
+        # Fallback to basic text extraction
+        if text:
+            blocks.append({'type': 'plain_text', 'text': text})
+    
+    return blocks
+
+def extract_with_tables_and_formatting(pdf_path, max_workers=None):
     """
     Advanced PDF to DOCX converter that preserves:
     - Tables
@@ -14,8 +167,7 @@ def extract_with_tables_and_formatting(pdf_path):
     - Bullet points
     - Better paragraph structure
     """
-    pdf = pdfplumber.open(pdf_path)
-    doc = Document()
+    doc = Document(io.BytesIO(_TEMPLATE_BYTES))
     
     # Set document margins
     sections = doc.sections
@@ -25,108 +177,90 @@ def extract_with_tables_and_formatting(pdf_path):
         section.left_margin = Inches(1)
         section.right_margin = Inches(1)
     
-    for page_num, page in enumerate(pdf.pages, 1):
+    # Pages are extracted in worker processes; the document is only touched here
+    for page_num, blocks in enumerate(extract_pages(pdf_path, max_workers), 1):
         if page_num > 1:
             doc.add_page_break()
         
-        print(f"Processing page {page_num}...")
-        
-        # Try to extract tables first
-        tables = page.extract_tables()
-        if tables:
-            for table_data in tables:
-                if table_data and len(table_data) > 0:
-                    # Create table in Word
-                    table = doc.add_table(rows=len(table_data), cols=len(table_data[0]))
-                    table.style = 'Table Grid'
-                    
-                    for i, row in enumerate(table_data):
-                        for j, cell_text in enumerate(row):
-                            if cell_text:
-                                table.rows[i].cells[j].text = str(cell_text).strip()
-                    
-                    doc.add_paragraph()  # Add space after table
-        
-        # Extract text with character-level details for better formatting
-        chars = page.chars
-        if chars:
-            # Group characters by line
-            lines = {}
-            for char in chars:
-                y = round(char['y0'], 1)  # Round to group chars on same line
-                if y not in lines:
-                    lines[y] = []
-                lines[y].append(char)
-            
-            # Sort lines by vertical position (top to bottom)
-            sorted_lines = sorted(lines.items(), key=lambda x: x[0], reverse=True)
-            
-            current_paragraph_text = []
-            
-            for y_pos, line_chars in sorted_lines:
-                # Sort characters in line by horizontal position
-                line_chars.sort(key=lambda c: c['x0'])
-                
-                # Extract text from line
-                line_text = ''.join(char['text'] for char in line_chars).strip()
-                
-                if not line_text:
-                    # Empty line - finish current paragraph
-                    if current_paragraph_text:
-                        para_text = ' '.join(current_paragraph_text)
-                        add_formatted_paragraph(doc, para_text, line_chars)
-                        current_paragraph_text = []
-                    continue
-                
-                # Detect if this should be a new paragraph (large font, all caps, etc.)
-                avg_font_size = sum(char.get('size', 12) for char in line_chars) / len(line_chars)
-                is_likely_header = (
-                    avg_font_size > 14 or 
-                    line_text.isupper() or 
-                    len(line_text) < 50
-                )
-                
-                if is_likely_header and current_paragraph_text:
-                    # Finish previous paragraph
-                    para_text = ' '.join(current_paragraph_text)
-                    add_formatted_paragraph(doc, para_text, [])
-                    current_paragraph_text = []
-                    
-                    # Add header
-                    if line_text.isupper() and len(line_text) < 30:
-                        heading = doc.add_heading(line_text, level=2)
-                    else:
-                        para = doc.add_paragraph()
-                        run = para.add_run(line_text)
-                        if avg_font_size > 14:
-                            run.font.size = Pt(int(avg_font_size))
-                            run.bold = True
+        for block in blocks:
+            if block['type'] == 'table':
+                add_table(doc, block['rows'])
+            elif block['type'] == 'paragraph':
+                add_formatted_paragraph(doc, block['text'], [])
+            elif block['type'] == 'heading':
+                add_paragraph_xml(doc, block['text'], style_id='Heading2')
+            elif block['type'] == 'emphasis':
+                if block['font_size'] > 14:
+                    add_paragraph_xml(doc, block['text'], bold=True, size=Pt(int(block['font_size'])))
                 else:
-                    current_paragraph_text.append(line_text)
-            
-            # Add any remaining paragraph
-            if current_paragraph_text:
-                para_text = ' '.join(current_paragraph_text)
-                add_formatted_paragraph(doc, para_text, [])
-        
-        else:
-            # Fallback to basic text extraction
-            text = page.extract_text()
-            if text:
-                lines = text.split('\n')
-                for line in lines:
-                    line = line.strip()
-                    if line:
-                        if detect_bullet_point(line):
-                            add_bullet_point(doc, line)
-                        elif line.isupper() and len(line) < 50:
-                            doc.add_heading(line, level=2)
-                        else:
-                            doc.add_paragraph(line)
-    
-    pdf.close()
+                    add_paragraph_xml(doc, block['text'])
+            else:  # plain_text
+                add_plain_text(doc, block['text'])
+    
     return doc
 
+def add_table(doc, table_data):
+    """Add extracted table rows as a Word table"""
+    table = doc.add_table(rows=len(table_data), cols=len(table_data[0]))
+    table.style = 'Table Grid'
+    
+    # Slice the flat cell list per row instead of resolving table.rows[i].cells[j] each time
+    cells = table._cells
+    col_count = len(table_data[0])
+    for i, row in enumerate(table_data):
+        for cell, cell_text in zip(cells[i * col_count:(i + 1) * col_count], row):
+            if cell_text:
+                cell.text = str(cell_text).strip()
+    
+    doc.add_paragraph()  # Add space after table
+
+def add_plain_text(doc, text):
+    """Add text from basic extraction line by line"""
+    lines = text.split('\n')
+    for line in lines:
+        line = line.strip()
+        if line:
+            if detect_bullet_point(line):
+                add_bullet_point(doc, line)
+            elif line.isupper() and len(line) < 50:
+                doc.add_heading(line, level=2)
+            else:
+                doc.add_paragraph(line)
+
+def add_paragraph_xml(doc, text='', style_id=None, alignment=None, left_indent=None,
+                      bold=False, italic=False, underline=False, size=None):
+    """
+    Append a paragraph straight to the document body XML, skipping the
+    python-docx Paragraph/Run wrappers and style-name lookups.
+    `style_id` is the style's XML id (e.g. 'Heading2'), not its display name.
+    """
+    p = doc.element.body.add_p()
+    
+    if style_id or alignment is not None or left_indent is not None:
+        pPr = p.get_or_add_pPr()
+        if style_id:
+            pPr.style = style_id
+        if alignment is not None:
+            pPr.jc_val = alignment
+        if left_indent is not None:
+            pPr.ind_left = left_indent
+    
+    if text:
+        r = p.add_r()
+        if bold or italic or underline or size:
+            rPr = r.get_or_add_rPr()
+            if bold:
+                rPr.get_or_add_b()
+            if italic:
+                rPr.get_or_add_i()
+            if underline:
+                rPr.u_val = WD_UNDERLINE.SINGLE
+            if size:
+                rPr.sz_val = size
+        r.text = text
+    
+    return p
+
 def add_formatted_paragraph(doc, text, chars):
     """Add a paragraph with basic formatting detection"""
     text = text.strip()
@@ -136,30 +270,41 @@ def add_formatted_paragraph(doc, text, chars):
     if detect_bullet_point(text):
         add_bullet_point(doc, text)
     elif text.isupper() and len(text) < 50:
-        doc.add_heading(text, level=2)
+        add_paragraph_xml(doc, text, style_id='Heading2')
     else:
-        para = doc.add_paragraph(text)
         # Try to detect and preserve some formatting
-        if any(keyword in text.lower() for keyword in ['summary', 'objective', 'experience', 'education', 'skills']):
-            run = para.runs[0] if para.runs else para.add_run()
-            run.bold = True
+        add_paragraph_xml(doc, text, bold=_SECTION_RE.search(text.lower()) is not None)
 
 def detect_bullet_point(text):
     """Detect if text should be a bullet point"""
-    bullet_indicators = ['•', '◦', '-', '*', '▪', '▫']
-    return any(text.startswith(indicator) for indicator in bullet_indicators) or \
-           re.match(r'^\s*[\d]+\.', text) or \
-           re.match(r'^\s*[a-zA-Z]\.', text)
+    return text[:1] in _BULLET_CHARS or _BULLET_ANY_RE.match(text) is not None
 
 def add_bullet_point(doc, text):
     """Add text as a bullet point"""
-    # Remove common bullet characters
-    text = re.sub(r'^[\s•◦\-*▪▫]+', '', text).strip()
-    text = re.sub(r'^\d+\.\s*', '', text).strip()  # Remove numbered bullets
-    text = re.sub(r'^[a-zA-Z]\.\s*', '', text).strip()  # Remove lettered bullets
+    # Remove the bullet, number or letter marker in one pass
+    match = _BULLET_ANY_RE.match(text)
+    text = text[match.end():].strip() if match else text.strip()
     
     if text:
-        para = doc.add_paragraph(text, style='List Bullet')
+        add_paragraph_xml(doc, text, style_id='ListBullet')
+
+def save_document(doc, path):
+    """
+    Save `doc` like doc.save(), but deflate parts at level 1. On large
+    documents most of the save time goes to compressing document.xml.
+    """
+    package = doc.part.package
+    parts = list(package.parts)
+    for part in parts:
+        part.before_marshal()
+    
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
+        zipf.writestr(CONTENT_TYPES_URI.membername, _ContentTypesItem.from_parts(parts).blob)
+        zipf.writestr(PACKAGE_URI.rels_uri.membername, package.rels.xml)
+        for part in parts:
+            zipf.writestr(part.partname.membername, part.blob)
+            if len(part.rels):
+                zipf.writestr(part.partname.rels_uri.membername, part.rels.xml)
 
 # Main execution
 if __name__ == "__main__":
@@ -170,7 +315,7 @@ if __name__ == "__main__":
         doc = extract_with_tables_and_formatting(pdf_path)
         
         output_filename = "PDF-Advanced-Formatted.docx"
-        doc.save(output_filename)
+        save_document(doc, output_filename)
         print(f"✅ Advanced conversion complete! Saved as '{output_filename}'")
         print("This version preserves:")
         print("- Tables and their structure")
@@ -5,36 +5,144 @@ Requires additional packages: pdf2image, Pillow
 """
 
 import pdfplumber
+import docx
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_UNDERLINE
+from docx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+from docx.opc.pkgwriter import _ContentTypesItem
+import io
+import os
 import re
 import sys
+import zipfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+
+# Optional extras; when missing, the CLI installs them via install_requirements()
+try:
+    import pdf2image
+except ImportError:
+    pdf2image = None
+
+# Single-character bullet glyphs, checked with a set lookup before any regex
+_BULLET_CHARS = frozenset('•◦-*▪▫')
+_NUM_DOT_RE = re.compile(r'^\s*\d+\.')
+# Matches a leading bullet glyph run, numbered marker or lettered marker
+_BULLET_ANY_RE = re.compile(r'^(?:[\s•◦\-*▪▫]+|\s*\d+\.\s*|\s*[a-zA-Z]\.\s*)')
+# Strips any run of glyphs, digits and dots, e.g. '1.2.3 ' or '• 1. '
+_LIST_MARKER_STRIP_RE = re.compile(r'^[\s•◦\-*▪▫\d.]+')
+_PHONE_RE = re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b')
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+# Common resume section names, matched against lowercased text
+_SECTION_RE = re.compile(r'experience|education|skills|summary|objective|projects|certifications')
+
+# python-docx's default template, read once and reused for every conversion
+with open(os.path.join(os.path.dirname(docx.__file__), 'templates', 'default.docx'), 'rb') as _template:
+    _TEMPLATE_BYTES = _template.read()
 
 def install_requirements():
-    """Install additional required packages"""
-    try:
-        import pdf2image
-        from PIL import Image
+    """Install additional required packages (only the CLI calls this)"""
+    if pdf2image is not None:
         print("✅ All required packages are available")
         return True
-    except ImportError:
-        print("📦 Installing required packages...")
-        import subprocess
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "pdf2image", "Pillow"])
-            print("✅ Packages installed successfully!")
-            return True
-        except Exception as e:
-            print(f"❌ Failed to install packages: {e}")
-            return False
+    
+    print("📦 Installing required packages...")
+    import subprocess
+    try:
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "pdf2image", "Pillow"])
+        print("✅ Packages installed successfully!")
+        return True
+    except Exception as e:
+        print(f"❌ Failed to install packages: {e}")
+        return False
 
-def ultra_preserve_formatting(pdf_path):
+PAGE_WINDOW = 50  # Max pages one worker keeps open; bounds pdfplumber's cached layout objects
+MIN_PAGES_PER_WORKER = 10  # Below this, process start-up and PDF reopening cost more than they save
+
+def extract_pages(pdf_path, max_workers=None):
+    """
+    Yield each page's blocks in page order, extracting page windows in
+    parallel worker processes
+    """
+    with pdfplumber.open(pdf_path) as pdf:
+        total_pages = len(pdf.pages)
+    
+    max_workers = max_workers or os.cpu_count() or 1
+    window = min(PAGE_WINDOW, max(MIN_PAGES_PER_WORKER, -(-total_pages // max_workers)))
+    tasks = [
+        (pdf_path, list(range(start + 1, min(start + window, total_pages) + 1)))
+        for start in range(0, total_pages, window)
+    ]
+    
+    if max_workers == 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield from extract_page_range(task)
+        return
+    
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+        for page_blocks in executor.map(extract_page_range, tasks):
+            yield from page_blocks
+
+def extract_page_range(task):
+    """Open the PDF for one window of pages and return each page's blocks"""
+    pdf_path, page_numbers = task
+    results = []
+    with pdfplumber.open(pdf_path, pages=page_numbers) as pdf:
+        for page_num, page in zip(page_numbers, pdf.pages):
+            print(f"🔄 Processing page {page_num} with ultra formatting...")
+            results.append(extract_page_blocks(page))
+    return results
+
+def extract_page_blocks(page):
+    """
+    Extract a page into a list of plain dict blocks (tables, text blocks,
+    fallback text) that can be sent back from a worker process
+    """
+    blocks = []
+    
+    # Method 1: Extract tables with precise formatting
+    table_areas = []
+    
+    for table in page.find_tables():
+        table_data = table.extract()
+        if table_data and len(table_data) > 0:
+            print(f"  📊 Found table with {len(table_data)} rows")
+            blocks.append({'type': 'table', 'rows': table_data})
+            table_areas.append(table.bbox)
+    
+    # Method 2: Word-level analysis for precise text formatting
+    words = page.extract_words(extra_attrs=['size', 'fontname'])
+    text = None if words else page.extract_text()
+    
+    # Everything needed from the page is pulled out; drop its parsed chars and
+    # layout objects now so they are not held during the grouping work below
+    page.flush_cache()
+    
+    if words:
+        # Drop words inside a table; they were already emitted as table cells
+        if table_areas:
+            words = [
+                word for word in words
+                if not any(x0 <= word['x0'] <= x1 and top <= word['top'] <= bottom
+                           for x0, top, x1, bottom in table_areas)
+            ]
+        
+        # Group words by their properties and position
+        blocks.extend(analyze_text_blocks(words))
+    
+    # Method 3: Fallback text extraction with smart parsing
+    elif text:
+        blocks.append({'type': 'raw_text', 'text': text})
+    
+    return blocks
+
+def ultra_preserve_formatting(pdf_path, max_workers=None):
     """
     Ultimate formatting preservation using multiple extraction methods
     """
-    pdf = pdfplumber.open(pdf_path)
-    doc = Document()
+    doc = Document(io.BytesIO(_TEMPLATE_BYTES))
     
     # Set document margins to match typical PDF layout
     sections = doc.sections
@@ -44,95 +152,77 @@ def ultra_preserve_formatting(pdf_path):
         section.left_margin = Inches(0.8)
         section.right_margin = Inches(0.8)
     
-    for page_num, page in enumerate(pdf.pages, 1):
+    # Pages are extracted in worker processes; the document is only touched here
+    for page_num, blocks in enumerate(extract_pages(pdf_path, max_workers), 1):
         if page_num > 1:
             doc.add_page_break()
         
-        print(f"🔄 Processing page {page_num} with ultra formatting...")
-        
-        # Method 1: Extract tables with precise formatting
-        tables = page.extract_tables()
-        table_areas = []
-        
-        if tables:
-            for table_data in tables:
-                if table_data and len(table_data) > 0:
-                    print(f"  📊 Found table with {len(table_data)} rows")
-                    
-                    # Create Word table
-                    word_table = doc.add_table(rows=len(table_data), cols=len(table_data[0]))
-                    word_table.style = 'Light Grid Accent 1'
-                    
-                    # Fill table with data
-                    for i, row in enumerate(table_data):
-                        for j, cell_text in enumerate(row):
-                            if cell_text:
-                                cell = word_table.rows[i].cells[j]
-                                cell.text = str(cell_text).strip()
-                                
-                                # Basic cell formatting
-                                for paragraph in cell.paragraphs:
-                                    for run in paragraph.runs:
-                                        run.font.size = Pt(11)
-                    
-                    doc.add_paragraph()  # Space after table
-        
-        # Method 2: Character-level analysis for precise text formatting
-        chars = page.chars
-        if chars:
-            # Group characters by their properties and position
-            text_blocks = analyze_text_blocks(chars)
-            
-            for block in text_blocks:
+        for block in blocks:
+            if block['type'] == 'table':
+                add_table_block(doc, block['rows'])
+            elif block['type'] == 'raw_text':
+                smart_text_parsing(doc, block['text'])
+            else:
                 add_formatted_text_block(doc, block)
-        
-        # Method 3: Fallback text extraction with smart parsing
-        else:
-            text = page.extract_text()
-            if text:
-                smart_text_parsing(doc, text)
     
-    pdf.close()
     return doc
 
-def analyze_text_blocks(chars):
+def add_table_block(doc, table_data):
+    """Add extracted table rows as a formatted Word table"""
+    word_table = doc.add_table(rows=len(table_data), cols=len(table_data[0]))
+    word_table.style = 'Light Grid Accent 1'
+    
+    # Fill table with data, slicing the flat cell list per row instead of
+    # resolving word_table.rows[i].cells[j] each time
+    cells = word_table._cells
+    col_count = len(table_data[0])
+    for i, row in enumerate(table_data):
+        for cell, cell_text in zip(cells[i * col_count:(i + 1) * col_count], row):
+            if cell_text:
+                # New cells hold one empty paragraph; add the formatted run to it directly
+                run = cell.paragraphs[0].add_run(str(cell_text).strip())
+                run.font.size = Pt(11)
+    
+    doc.add_paragraph()  # Space after table
+
+def analyze_text_blocks(words):
     """
-    Analyze character-level data to group into formatted text blocks
+    Analyze word-level data (from page.extract_words) to group into formatted text blocks
     """
-    # Group characters by line and analyze their properties
-    lines = {}
-    
-    for char in chars:
-        y = round(char['y0'], 2)
-        if y not in lines:
-            lines[y] = {
-                'chars': [],
-                'font_sizes': [],
-                'fonts': [],
-                'x_positions': []
-            }
-        
-        lines[y]['chars'].append(char)
-        lines[y]['font_sizes'].append(char.get('size', 12))
-        lines[y]['fonts'].append(char.get('fontname', 'default'))
-        lines[y]['x_positions'].append(char['x0'])
+    # Pull the per-word fields into parallel lists once
+    y_keys = [round(word['bottom'], 2) for word in words]
+    x_positions = [word['x0'] for word in words]
+    font_sizes = [word['size'] for word in words]
+    fonts = [sys.intern(word['fontname'] or 'default') for word in words]  # One shared string per font
+    texts = [word['text'] for word in words]
+    
+    # Order words top to bottom, then left to right. Plain (y, x, index)
+    # tuples compare in C, so no per-word key function is called
+    order = [i for _, _, i in sorted(zip(y_keys, x_positions, range(len(words))))]
+    
+    # Reorder every column once so each line is a contiguous slice
+    y_keys = list(map(y_keys.__getitem__, order))
+    x_positions = list(map(x_positions.__getitem__, order))
+    font_sizes = list(map(font_sizes.__getitem__, order))
+    fonts = list(map(fonts.__getitem__, order))
+    texts = list(map(texts.__getitem__, order))
     
     # Convert to text blocks with formatting info
     text_blocks = []
-    sorted_lines = sorted(lines.items(), key=lambda x: x[0], reverse=True)
+    end = 0
     
-    for y_pos, line_data in sorted_lines:
-        chars_in_line = sorted(line_data['chars'], key=lambda c: c['x0'])
-        text = ''.join(char['text'] for char in chars_in_line).strip()
+    for y_pos, run in groupby(y_keys):
+        start, end = end, end + len(list(run))
+        text = ' '.join(texts[start:end]).strip()
         
         if not text:
             text_blocks.append({'type': 'empty', 'text': ''})
             continue
         
         # Analyze formatting
-        avg_font_size = sum(line_data['font_sizes']) / len(line_data['font_sizes'])
-        most_common_font = max(set(line_data['fonts']), key=line_data['fonts'].count)
-        indent_level = min(line_data['x_positions']) if line_data['x_positions'] else 0
+        avg_font_size = sum(font_sizes[start:end]) / (end - start)
+        most_common_font = Counter(fonts[start:end]).most_common(1)[0][0]
+        indent_level = x_positions[start]  # Line is already ordered by x0
         
         # Classify text type
         block_type = classify_text_type(text, avg_font_size, indent_level)
@@ -147,91 +237,125 @@ def analyze_text_blocks(chars):
     
     return text_blocks
 
+def _build_class_lut():
+    """
+    Precompute the layout-only part of classify_text_type for every key
+    (fs_bucket << 3 | upper_short << 2 | indented << 1 | bullet)
+    """
+    lut = []
+    for key in range(3 << 3):
+        fs_bucket, upper_short, indented, bullet = key >> 3, key >> 2 & 1, key >> 1 & 1, key & 1
+        if fs_bucket == 2:
+            lut.append('heading1')
+        elif fs_bucket == 1 or upper_short:
+            lut.append('heading2')
+        elif bullet:
+            lut.append('bullet')
+        elif indented:
+            lut.append('indented')
+        else:
+            lut.append('paragraph')
+    return tuple(lut)
+
+_CLASS_LUT = _build_class_lut()
+
 def classify_text_type(text, font_size, indent_level):
     """Classify what type of text this is based on content and formatting"""
+    text_len = len(text)
     
-    # Check for headers (large font, short text, all caps, etc.)
-    if font_size > 16:
-        return 'heading1'
-    elif font_size > 14:
-        return 'heading2'
-    elif text.isupper() and len(text) < 50:
-        return 'heading2'
-    
-    # Check for bullet points
-    if re.match(r'^[\s•◦\-*▪▫]', text) or re.match(r'^\s*\d+\.', text):
-        return 'bullet'
-    
-    # Check for contact info or special formatting
-    if re.search(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', text):  # Phone number
-        return 'contact'
-    elif re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text):  # Email
-        return 'contact'
-    
-    # Check for section headers (common resume sections)
-    section_keywords = ['experience', 'education', 'skills', 'summary', 'objective', 'projects', 'certifications']
-    if any(keyword in text.lower() for keyword in section_keywords) and len(text) < 30:
-        return 'section_header'
-    
-    # High indentation suggests sub-items
-    if indent_level > 50:
-        return 'indented'
-    
-    return 'paragraph'
+    # Fold the layout checks (font size, short all-caps, indent, bullet marker)
+    # into one lookup key; the bullet check is skipped once a line is a heading
+    fs_bucket = 2 if font_size > 16 else 1 if font_size > 14 else 0
+    upper_short = text_len < 50 and text.isupper()
+    bullet = not (fs_bucket or upper_short) and (
+        text[:1] in _BULLET_CHARS or _NUM_DOT_RE.match(text) is not None
+    )
+    block_type = _CLASS_LUT[fs_bucket << 3 | upper_short << 2 | (indent_level > 50) << 1 | bullet]
+    
+    # Contact info and section headers outrank indentation, so the content
+    # regexes only run for lines the layout left as plain or indented text
+    if block_type == 'paragraph' or block_type == 'indented':
+        if _PHONE_RE.search(text) or _EMAIL_RE.search(text):
+            return 'contact'
+        if text_len < 30 and _SECTION_RE.search(text.lower()):
+            return 'section_header'
+    
+    return block_type
 
 def add_formatted_text_block(doc, block):
     """Add a text block with appropriate formatting"""
     
     if block['type'] == 'empty':
-        doc.add_paragraph()
+        add_paragraph_xml(doc)
         return
     
     text = block['text']
     
     if block['type'] == 'heading1':
-        heading = doc.add_heading(text, level=1)
-        heading.alignment = WD_ALIGN_PARAGRAPH.LEFT
+        add_paragraph_xml(doc, text, style_id='Heading1', alignment=WD_ALIGN_PARAGRAPH.LEFT)
     
     elif block['type'] == 'heading2':
-        heading = doc.add_heading(text, level=2)
-        heading.alignment = WD_ALIGN_PARAGRAPH.LEFT
+        add_paragraph_xml(doc, text, style_id='Heading2', alignment=WD_ALIGN_PARAGRAPH.LEFT)
     
     elif block['type'] == 'section_header':
-        heading = doc.add_heading(text, level=2)
-        heading.alignment = WD_ALIGN_PARAGRAPH.LEFT
         # Add underline for section headers
-        for run in heading.runs:
-            run.underline = True
+        add_paragraph_xml(doc, text, style_id='Heading2', alignment=WD_ALIGN_PARAGRAPH.LEFT,
+                          underline=True)
     
     elif block['type'] == 'bullet':
         # Clean bullet text
-        clean_text = re.sub(r'^[\s•◦\-*▪▫]+', '', text).strip()
-        clean_text = re.sub(r'^\d+\.\s*', '', clean_text).strip()
+        match = _BULLET_ANY_RE.match(text)
+        clean_text = text[match.end():].strip() if match else text.strip()
         if clean_text:
-            para = doc.add_paragraph(clean_text, style='List Bullet')
+            add_paragraph_xml(doc, clean_text, style_id='ListBullet')
     
     elif block['type'] == 'contact':
-        para = doc.add_paragraph(text)
-        para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        for run in para.runs:
-            run.font.size = Pt(11)
-            run.italic = True
+        add_paragraph_xml(doc, text, alignment=WD_ALIGN_PARAGRAPH.CENTER, italic=True, size=Pt(11))
     
     elif block['type'] == 'indented':
-        para = doc.add_paragraph(text)
-        para.paragraph_format.left_indent = Inches(0.5)
-        for run in para.runs:
-            run.font.size = Pt(10)
+        add_paragraph_xml(doc, text, left_indent=Inches(0.5), size=Pt(10))
     
     else:  # paragraph
-        para = doc.add_paragraph(text)
         # Preserve approximate font size
-        for run in para.runs:
-            if block['font_size'] > 12:
-                run.font.size = Pt(int(block['font_size']))
+        size = Pt(int(block['font_size'])) if block['font_size'] > 12 else None
+        add_paragraph_xml(doc, text, size=size)
+
+def add_paragraph_xml(doc, text='', style_id=None, alignment=None, left_indent=None,
+                      bold=False, italic=False, underline=False, size=None):
+    """
+    Append a paragraph straight to the document body XML, skipping the
+    python-docx Paragraph/Run wrappers and style-name lookups.
+    `style_id` is the style's XML id (e.g. 'Heading2'), not its display name.
+    """
+    p = doc.element.body.add_p()
+    
+    if style_id or alignment is not None or left_indent is not None:
+        pPr = p.get_or_add_pPr()
+        if style_id:
+            pPr.style = style_id
+        if alignment is not None:
+            pPr.jc_val = alignment
+        if left_indent is not None:
+            pPr.ind_left = left_indent
+    
+    if text:
+        r = p.add_r()
+        if bold or italic or underline or size:
+            rPr = r.get_or_add_rPr()
+            if bold:
+                rPr.get_or_add_b()
+            if italic:
+                rPr.get_or_add_i()
+            if underline:
+                rPr.u_val = WD_UNDERLINE.SINGLE
+            if size:
+                rPr.sz_val = size
+        r.text = text
+    
+    return p
 
 def smart_text_parsing(doc, text):
-    """Fallback smart text parsing when character data isn't available"""
+    """Fallback smart text parsing when word data isn't available"""
     lines = text.split('\n')
     
     for line in lines:
@@ -243,13 +367,33 @@ def smart_text_parsing(doc, text):
         # Apply smart formatting based on content
         if line.isupper() and len(line) < 50:
             doc.add_heading(line, level=2)
-        elif re.match(r'^[\s•◦\-*▪▫]', line) or re.match(r'^\s*\d+\.', line):
-            clean_text = re.sub(r'^[\s•◦\-*▪▫\d.]+', '', line).strip()
+            continue
+        
+        if line[:1] in _BULLET_CHARS or _NUM_DOT_RE.match(line):
+            clean_text = _LIST_MARKER_STRIP_RE.sub('', line, count=1).strip()
             if clean_text:
                 doc.add_paragraph(clean_text, style='List Bullet')
         else:
             doc.add_paragraph(line)
 
+def save_document(doc, path):
+    """
+    Save `doc` like doc.save(), but deflate parts at level 1. On large
+    documents most of the save time goes to compressing document.xml.
+    """
+    package = doc.part.package
+    parts = list(package.parts)
+    for part in parts:
+        part.before_marshal()
+    
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
+        zipf.writestr(CONTENT_TYPES_URI.membername, _ContentTypesItem.from_parts(parts).blob)
+        zipf.writestr(PACKAGE_URI.rels_uri.membername, package.rels.xml)
+        for part in parts:
+            zipf.writestr(part.partname.membername, part.blob)
+            if len(part.rels):
+                zipf.writestr(part.partname.rels_uri.membername, part.rels.xml)
+
 # Main execution
 if __name__ == "__main__":
     print("🚀 Ultra-Advanced PDF to DOCX Converter")
@@ -269,7 +413,7 @@ if __name__ == "__main__":
         doc = ultra_preserve_formatting(pdf_path)
         
         output_filename = "PDF-Ultra-Formatted.docx"
-        doc.save(output_filename)
+        save_document(doc, output_filename)
         
         print(f"\n✅ Ultra-conversion complete!")
         print(f"📄 Output saved as: {output_filename}")